@@ -1,3 +1,3 @@
 """Markdown Spider package."""
 
-__version__ = "0.1.0"
+__version__ = "0.1.1"
@@ -1,195 +1,244 @@
+import argparse
 import sys
-import click
 import os
-import yaml
 import logging
-from .converter import MarkdownSpider
 
-# Set up logging
-logging.basicConfig(
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
+from . import __version__
+
 logger = logging.getLogger("markdown_spider")
 
+_BANNER = """
+    🕸️  Markdown Spider 🔽
+    --------------------------
+    Recursively crawls websites and saves content
+    as markdown or HTML files
+    """
 
-def load_config_file(config_file):
-    """Load configuration from a YAML or TOML file"""
-    if not os.path.exists(config_file):
-        raise click.BadParameter(f"Config file not found: {config_file}")
+# Result messages, pre-wrapped in ANSI color escapes (green/red ... reset)
+_SUCCESS_PREFIX = "\033[32m\n✅ Successfully crawled "
+_SUCCESS_SUFFIX = " pages!\033[0m"
+_SAVED_PREFIX = "\033[32mContent saved to: "
+_SAVED_SUFFIX = "\033[0m"
+_NO_PAGES_MESSAGE = (
+    "\033[31m\n❌ No pages were crawled. Check your configuration.\033[0m"
+)
+
+_YAML_EXTS = (".yaml", ".yml")
+
+
+def _config_cache_path(config_file):
+    """Path of the JSON cache for a config file, keyed by its absolute path"""
+    import hashlib
 
-    file_ext = os.path.splitext(config_file)[1].lower()
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    digest = hashlib.blake2b(
+        os.path.abspath(config_file).encode("utf-8"), digest_size=20
+    ).hexdigest()
+    return os.path.join(cache_root, "markdown_spider", f"config-{digest}.json")
+
+
+def _read_config_cache(cache_path, mtime_ns):
+    """Return the cached config if it was parsed from this mtime, else None"""
+    import json
 
     try:
-        if file_ext in [".yaml", ".yml"]:
-            with open(config_file, "r") as f:
-                return yaml.safe_load(f)
+        with open(cache_path, "rb") as f:
+            cached = json.load(f)
+    except Exception:
+        return None
+    if not isinstance(cached, dict) or cached.get("mtime_ns") != mtime_ns:
+        return None
+    return cached.get("config")
+
+
+def _write_config_cache(cache_path, mtime_ns, config):
+    """Atomically store a parsed config; failures only cost a re-parse next time"""
+    import json
+    import tempfile
+
+    try:
+        payload = json.dumps({"mtime_ns": mtime_ns, "config": config})
+        # Configs JSON can't reproduce exactly (dates, non-string keys) aren't cached
+        if json.loads(payload)["config"] != config:
+            return
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(temp_path, cache_path)
+    except Exception as e:
+        logger.debug(f"Could not write config cache {cache_path}: {e}")
+
+
+def load_config_file(config_file):
+    """Load configuration from a YAML or TOML file
+
+    Parsed YAML configs are cached under ~/.cache/markdown_spider and reused until
+    the file's modification time changes.
+    """
+    try:
+        if config_file.lower().endswith(_YAML_EXTS):
+            mtime_ns = os.stat(config_file).st_mtime_ns
+            cache_path = _config_cache_path(config_file)
+            cached = _read_config_cache(cache_path, mtime_ns)
+            if cached is not None:
+                return cached
+
+            import yaml
+
+            try:
+                from yaml import CSafeLoader as SafeLoader
+            except ImportError:
+                from yaml import SafeLoader
+
+            # Hand libyaml the raw bytes in one buffer; it detects the encoding
+            with open(config_file, "rb") as f:
+                config = yaml.load(f.read(), Loader=SafeLoader)
+            _write_config_cache(cache_path, mtime_ns, config)
+            return config
+        elif config_file.lower().endswith(".toml"):
+            import tomllib
+
+            with open(config_file, "rb") as f:
+                return tomllib.load(f)
         else:
-            raise click.BadParameter(f"Unsupported config file format: {file_ext}")
+            file_ext = os.path.splitext(config_file)[1].lower()
+            raise ValueError(f"Unsupported config file format: {file_ext}")
+    except FileNotFoundError as e:
+        raise ValueError(f"Config file not found: {config_file}") from e
     except Exception as e:
-        raise click.BadParameter(f"Failed to parse config file: {str(e)}")
+        raise ValueError(f"Failed to parse config file: {str(e)}")
+
+
+def _do_generate_config(path):
+    """Write the bundled sample configuration to path"""
+    if not path.endswith(_YAML_EXTS):
+        print("Please specify a .yaml or .yml file extension")
+        return 0
+
+    import importlib.resources
+
+    sample_config = (
+        importlib.resources.files("markdown_spider")
+        .joinpath("sample_config.yaml")
+        .read_bytes()
+    )
+    with open(path, "wb") as f:
+        f.write(sample_config)
+    print(f"Sample YAML configuration written to {path}")
+    return 0
 
 
 def print_banner():
-    banner = """
-    🕸️  Markdown Spider 🔽
-    --------------------------
-    Recursively crawls websites and saves content
-    as markdown or HTML files
-    """
-    print(banner)
-
-
-@click.command()
-@click.option("--url", "-u", help="Base URL to start crawling from")
-@click.option("--output-dir", "-o", help="Directory to save files")
-@click.option("--max-depth", "-d", type=int, help="Maximum crawl depth")
-@click.option("--num-threads", "-t", type=int, help="Number of worker threads")
-@click.option("--throttle", "-r", type=float, help="Delay between requests in seconds")
-@click.option("--debug", is_flag=True, help="Enable debug logging")
-@click.option("--domain-only", is_flag=True, help="Only crawl URLs on the same domain")
-@click.option("--format", "-f", type=click.Choice(["md", "html"]), help="Output format")
-@click.option("--user-agent", help="Custom User-Agent string")
-@click.option(
-    "--max-children", type=int, help="Maximum number of child URLs to process per page"
-)
-@click.option("--config", "-c", help="Path to YAML or TOML configuration file")
-@click.option(
-    "--generate-config",
-    "-g",
-    help="Generate a sample configuration file (YAML or TOML)",
-)
-@click.option(
-    "--force-overwrite",
-    is_flag=True,
-    help="Force overwrite existing files",
-)
-def main(
-    url,
-    output_dir,
-    max_depth,
-    num_threads,
-    throttle,
-    debug,
-    domain_only,
-    format,
-    user_agent,
-    max_children,
-    config,
-    generate_config,
-    force_overwrite,
-):
+    print(_BANNER)
+
+
+def build_parser():
+    """Build the command-line argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="markdown-spider",
+        description=(
+            "Recursively crawl websites and save content as markdown or HTML files. "
+            "Can be configured via command line options or a YAML/TOML config file. "
+            "Path-specific rules can be defined for different domains or URL paths."
+        ),
+    )
+    parser.add_argument("--url", "-u", help="Base URL to start crawling from")
+    parser.add_argument("--output-dir", "-o", help="Directory to save files")
+    parser.add_argument("--max-depth", "-d", type=int, help="Maximum crawl depth")
+    parser.add_argument(
+        "--num-threads", "-t", type=int, help="Number of worker threads"
+    )
+    parser.add_argument(
+        "--throttle", "-r", type=float, help="Delay between requests in seconds"
+    )
+    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    parser.add_argument(
+        "--domain-only",
+        action="store_true",
+        help="Only crawl URLs on the same domain",
+    )
+    parser.add_argument("--format", "-f", choices=["md", "html"], help="Output format")
+    parser.add_argument("--user-agent", help="Custom User-Agent string")
+    parser.add_argument(
+        "--max-children",
+        type=int,
+        help="Maximum number of child URLs to process per page",
+    )
+    parser.add_argument(
+        "--config", "-c", help="Path to YAML or TOML configuration file"
+    )
+    parser.add_argument(
+        "--generate-config",
+        "-g",
+        help="Generate a sample configuration file (YAML or TOML)",
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    parser.add_argument(
+        "--force-overwrite",
+        action="store_true",
+        help="Force overwrite existing files",
+    )
+    return parser
+
+
+def main(argv=None):
     """Recursively crawl websites and save content as markdown or HTML files.
 
     Can be configured via command line options or a YAML/TOML config file.
     Path-specific rules can be defined for different domains or URL paths.
     """
+    args = build_parser().parse_args(argv)
+
+    # Admin paths skip the banner and logging setup entirely
+    if args.generate_config:
+        return _do_generate_config(args.generate_config)
+
     print_banner()
 
-    # Configure logging level
-    if debug:
+    # Set up logging (not needed for --help or --generate-config). --debug only
+    # applies to our own loggers so urllib3 and friends stay quiet.
+    logging.basicConfig(
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        level=logging.INFO,
+    )
+    if args.debug:
         logger.setLevel(logging.DEBUG)
 
-    # Generate sample configuration if requested
-    if generate_config:
-        sample_config = {
-            "url": "https://www.pulumi.com/registry/packages/gcp/api-docs/",
-            "output_dir": "./pulumi_gcp_docs",
-            "max_depth": 3,
-            "num_threads": 12,
-            "throttle": 0.5,
-            "same_domain_only": False,
-            "file_extension": ".md",
-            "max_children_per_page": None,  # Set a number to limit child URLs per page
-            "headers": {"User-Agent": "Documentation Spider Bot"},
-            "path_configs": [
-                {
-                    "path_prefix": "https://www.pulumi.com/registry/packages/gcp/api-docs/",
-                    "target_content": ["div.docs-main-content"],
-                    "ignore_selectors": [
-                        "nav",
-                        "footer",
-                        ".header-nav",
-                        ".docs-breadcrumb",
-                        "#accordion-package-card",
-                        ".pulumi-ai-badge",
-                        ".docs-table-of-contents",
-                        ".package-details",
-                        "#package-details",
-                        "title",
-                    ],
-                    "exclude_patterns": [
-                        "/typescript/",
-                        "/go/",
-                        "/csharp/",
-                        "/examples/",
-                        "/command-line/",
-                        "/changelog/",
-                    ],
-                    "description": "Pulumi GCP API docs",
-                },
-                {
-                    "path_prefix": "https://cloud.google.com/",
-                    "target_content": [".devsite-article-body", "main", "article"],
-                    "ignore_selectors": [
-                        "nav",
-                        "header",
-                        "footer",
-                        ".devsite-feedback-balloon",
-                        ".devsite-book-nav",
-                    ],
-                    "description": "Google Cloud documentation",
-                },
-            ],
-        }
-
-        if generate_config.endswith((".yaml", ".yml")):
-            with open(generate_config, "w") as f:
-                yaml.dump(sample_config, f, default_flow_style=False, sort_keys=False)
-            click.echo(f"Sample YAML configuration written to {generate_config}")
-        else:
-            click.echo("Please specify a .yaml or .yml file extension")
-        return
-
     # Load configuration from file if provided
     spider_config = {}
-    if config:
+    if args.config:
         try:
-            spider_config = load_config_file(config)
-            logger.info(f"Loaded configuration from {config}")
-        except click.BadParameter as e:
-            click.echo(f"Error: {str(e)}")
-            sys.exit(1)
+            spider_config = load_config_file(args.config)
+            logger.info(f"Loaded configuration from {args.config}")
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return 1
 
     # Override config with command-line options
-    if url:
-        spider_config["url"] = url
-    if output_dir:
-        spider_config["output_dir"] = output_dir
-    if max_depth:
-        spider_config["max_depth"] = max_depth
-    if num_threads:
-        spider_config["num_threads"] = num_threads
-    if throttle:
-        spider_config["throttle"] = throttle
-    if domain_only:
-        spider_config["same_domain_only"] = domain_only
-    if format:
-        spider_config["file_extension"] = f".{format}"
-    if user_agent:
-        if "headers" not in spider_config:
-            spider_config["headers"] = {}
-        spider_config["headers"]["User-Agent"] = user_agent
-    if max_children:
-        spider_config["max_children_per_page"] = max_children
-    if force_overwrite:
-        spider_config["force_overwrite"] = force_overwrite
+    overrides = {
+        "url": args.url,
+        "output_dir": args.output_dir,
+        "max_depth": args.max_depth,
+        "num_threads": args.num_threads,
+        "throttle": args.throttle,
+        "same_domain_only": args.domain_only,
+        "max_children_per_page": args.max_children,
+        "force_overwrite": args.force_overwrite,
+    }
+    spider_config.update({k: v for k, v in overrides.items() if v})
+    if args.format:
+        spider_config["file_extension"] = f".{args.format}"
+    if args.user_agent:
+        spider_config.setdefault("headers", {})["User-Agent"] = args.user_agent
 
     # Check for required configuration
     if "url" not in spider_config:
-        click.echo("Error: No URL specified. Use --url option or config file.")
-        sys.exit(1)
+        print("Error: No URL specified. Use --url option or config file.")
+        return 1
     if "output_dir" not in spider_config:
         spider_config["output_dir"] = "./crawled_content"
 
@@ -201,6 +250,8 @@ def main(
     spider_config.setdefault("file_extension", ".md")
 
     # Create and run the spider
+    from .converter import MarkdownSpider
+
     spider = MarkdownSpider(
         base_url=spider_config["url"],
         output_dir=spider_config["output_dir"],
@@ -220,22 +271,13 @@ def main(
     pages_crawled = spider.run()
 
     if pages_crawled > 0:
-        click.echo(
-            click.style(f"\n✅ Successfully crawled {pages_crawled} pages!", fg="green")
-        )
-        click.echo(
-            click.style(
-                f"Content saved to: {os.path.abspath(spider_config['output_dir'])}",
-                fg="green",
-            )
-        )
-    else:
-        click.echo(
-            click.style(
-                "\n❌ No pages were crawled. Check your configuration.", fg="red"
-            )
-        )
+        print(f"{_SUCCESS_PREFIX}{pages_crawled}{_SUCCESS_SUFFIX}")
+        print(f"{_SAVED_PREFIX}{spider.output_dir_abs}{_SAVED_SUFFIX}")
+        return 0
+
+    print(_NO_PAGES_MESSAGE)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
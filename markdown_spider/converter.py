@@ -1,30 +1,102 @@
 #!/usr/bin/env python3
 
+import hashlib
 import os
+import shutil
+import subprocess
 import sys
 import tempfile
 import types
 import uuid
 import requests
 import logging
-import queue
 import threading
 import time
 import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import re
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup
 from markdownify import markdownify, MarkdownConverter, chomp
-import click
-import yaml
-
-# Set up logging
-logging.basicConfig(
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    level=logging.INFO,
-)
+
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used on every table cell, code block and page
+_MD_EMPH_RE = re.compile(r"(\*\*|__|\*|_|~~)")
+# Markdown links or emphasis markers, stripped from code in a single pass
+_CODE_MARKDOWN_RE = re.compile(r"\[(.*?)\]\(.*?\)|\*\*|__|\*|_|~~")
+_TEXT_ALIGN_RE = re.compile(r"text-align\s*:\s*(left|right|center)", re.IGNORECASE)
+_CODE_FENCE_GAP_RE = re.compile(r"```\s*\n```")
+_UNSAFE_FILENAME_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
+# Elements carrying a code language: a language-* class or a non-empty data-lang
+_CODE_LANGUAGE_SELECTOR = (
+    "[class^='language-'], [class*=' language-'], [data-lang]:not([data-lang=''])"
+)
+
+
+def _has_code_language(el):
+    """Check whether el itself specifies a code language"""
+    return bool(el.get("data-lang")) or any(
+        cls.startswith("language-") for cls in el.get("class", [])
+    )
+
+
+def _find_markdownlint():
+    """Resolve the markdownlint-cli2 command, or None if it can't be run"""
+    local_bin = os.path.join("node_modules", ".bin", "markdownlint-cli2")
+    path = shutil.which("markdownlint-cli2") or shutil.which(local_bin)
+    if path:
+        return [path]
+
+    # Fall back to npx, which can fetch the package on demand
+    npx = shutil.which("npx")
+    return [npx, "markdownlint-cli2"] if npx else None
+
+
+# Block elements that GFM tables can't represent
+_TABLE_BLOCK_TAGS = [
+    "table",
+    "pre",
+    "code",
+    "blockquote",
+    "ul",
+    "ol",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+]
+
+# Known column alignments, in tie-break order
+_ALIGNMENTS = ("left", "right", "center", "")
+
+_CELL_TRANSLATE = str.maketrans({"\n": " ", "|": "\\|"})
+
+
+def _strip_code_link(match):
+    """Replacement for _CODE_MARKDOWN_RE: link text without emphasis, else nothing"""
+    link_text = match.group(1)
+    return "" if link_text is None else _MD_EMPH_RE.sub("", link_text)
+
+
+def _content_digest(text):
+    """BLAKE2b hex digest of text, as stored in the .hash sidecar files"""
+    return hashlib.blake2b(text.encode("utf-8")).hexdigest()
+
+
+def _strip_code_markdown(text):
+    """Remove markdown links and emphasis markers from code text"""
+    # Cheap substring checks let most code blocks skip the regex engine
+    if "](" in text:
+        return _CODE_MARKDOWN_RE.sub(_strip_code_link, text)
+    if "*" in text or "_" in text or "~~" in text:
+        return _MD_EMPH_RE.sub("", text)
+    return text
+
 
 class BetterConverter(MarkdownConverter):
     """
@@ -37,13 +109,33 @@ class BetterConverter(MarkdownConverter):
         # Initialize properties
         self.tag_value_selections = options.get("tag_value_selections", {})
         self.pulumi_language = options.get("pulumi_language", None)
+        # Per-table results, keyed by id() of the table Tag. Only valid for the
+        # document currently being converted, so convert_soup resets them.
+        self._align_cache = {}
+        self._skip_table_cache = {}
+        self._header_table_cache = {}
+        # ids of divs containing a pulumi-choosable element, or None when not
+        # converting through convert_soup (convert_div then searches each div)
+        self._pulumi_divs = None
+
+    def convert_soup(self, soup):
+        self._align_cache.clear()
+        self._skip_table_cache.clear()
+        self._header_table_cache.clear()
+        # Most pages have no pulumi-choosable at all, so one find() settles it
+        self._pulumi_divs = (
+            {id(div) for div in soup.select("div:has(pulumi-choosable)")}
+            if soup.find("pulumi-choosable")
+            else set()
+        )
+        return super().convert_soup(soup)
 
     def convert_table(self, el, text, convert_as_inline):
         if self.should_skip_table(el):
             return text
 
         if self.should_keep_table_html(el):
-            return f"\n\n{el.prettify()}\n\n"
+            return f"\n\n{el.decode()}\n\n"
 
         # Remove any blank lines
         text = text.replace("\n\n", "\n")
@@ -69,7 +161,8 @@ class BetterConverter(MarkdownConverter):
         return f"\n\n{caption}{table_content}\n\n"
 
     def convert_tr(self, el, text, convert_as_inline):
-        if self.should_skip_table(el.find_parent("table")):
+        table = el.find_parent("table")
+        if self.should_skip_table(table):
             return text
 
         cells = el.find_all(["td", "th"])
@@ -77,7 +170,7 @@ class BetterConverter(MarkdownConverter):
 
         # Add separator row after header
         if self.is_header_row(el):
-            alignments = self.get_column_alignments(el.find_parent("table"))
+            alignments = self.get_column_alignments(table)
             separator = (
                 "\n|"
                 + "|".join(self.get_alignment_marker(align) for align in alignments)
@@ -91,13 +184,11 @@ class BetterConverter(MarkdownConverter):
         colspan = int(el.get("colspan", 1))
         content = super().process_tag(el, convert_as_inline=True)
 
-        # Clean up content
-        content = content.replace("\n", " ").strip()
-        content = content.replace("|", "\\|")  # Escape pipe characters
+        # Clean up content: flatten newlines and escape pipe characters
+        content = content.translate(_CELL_TRANSLATE).strip()
 
         # Pad short content
-        while len(content) < 3:
-            content += " "
+        content = content.ljust(3)
 
         # Handle colspan
         if colspan > 1:
@@ -110,40 +201,20 @@ class BetterConverter(MarkdownConverter):
         if not table:
             return True
 
-        rows = table.find_all("tr")
-        if not rows:
-            return True
-
-        # Skip single-cell tables
-        if len(rows) == 1 and len(rows[0].find_all(["td", "th"])) <= 1:
-            return True
-
-        return False
+        key = id(table)
+        if key not in self._skip_table_cache:
+            rows = table.find_all("tr")
+            self._skip_table_cache[key] = (
+                # Skip empty and single-cell tables
+                not rows
+                or (len(rows) == 1 and len(rows[0].find_all(["td", "th"])) <= 1)
+            )
+        return self._skip_table_cache[key]
 
     def should_keep_table_html(self, table):
         """Determine if table should be kept as HTML"""
         # Keep tables containing block elements that GFM tables don't support
-        block_elements = [
-            "table",
-            "pre",
-            "code",
-            "blockquote",
-            "ul",
-            "ol",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "h5",
-            "h6",
-            "hr",
-        ]
-
-        for tag in block_elements:
-            if table.find(tag):
-                return True
-
-        return False
+        return table.find(_TABLE_BLOCK_TAGS) is not None
 
     def is_header_row(self, tr):
         """Determine if tr is a header row"""
@@ -153,11 +224,10 @@ class BetterConverter(MarkdownConverter):
         if parent == "thead":
             return True
 
-        # If it's the first row in table/tbody
-        if tr == tr.parent.find("tr"):
-            if parent == "table" or (
-                parent == "tbody" and not tr.find_previous_sibling("thead")
-            ):
+        # If it's the first row in table/tbody (identity check; Tag equality
+        # would compare the rows' whole subtrees)
+        if parent in ("table", "tbody") and tr is tr.parent.find("tr"):
+            if parent == "table" or not tr.find_previous_sibling("thead"):
                 # Check if all cells are th
                 cells = tr.find_all(["td", "th"])
                 return all(cell.name == "th" for cell in cells)
@@ -166,60 +236,55 @@ class BetterConverter(MarkdownConverter):
 
     def has_header_row(self, table):
         """Check if table has a header row"""
-        first_row = table.find("tr")
-        return first_row and self.is_header_row(first_row)
+        key = id(table)
+        if key not in self._header_table_cache:
+            first_row = table.find("tr")
+            self._header_table_cache[key] = first_row and self.is_header_row(first_row)
+        return self._header_table_cache[key]
 
     def get_column_alignments(self, table):
         """Get alignment for each column"""
-        alignments = []
         if not table:
-            return alignments
-
-        # Get all rows
-        rows = table.find_all("tr")
-        if not rows:
-            return alignments
-
-        # Get max column count
-        max_cols = max(len(row.find_all(["td", "th"])) for row in rows)
-
-        # For each column, determine alignment
-        for col_idx in range(max_cols):
-            alignment = self.get_column_alignment(table, col_idx)
-            alignments.append(alignment)
+            return []
 
-        return alignments
-
-    def get_column_alignment(self, table, col_idx):
-        """Get alignment for a specific column"""
-        alignments = {"left": 0, "right": 0, "center": 0, "": 0}
+        key = id(table)
+        if key in self._align_cache:
+            return self._align_cache[key]
 
+        # Collect every column's alignments in a single pass over the rows
+        columns = []
         for row in table.find_all("tr"):
             cells = row.find_all(["td", "th"])
-            if col_idx < len(cells):
-                cell = cells[col_idx]
+            while len(columns) < len(cells):
+                columns.append([])
+
+            for column, cell in zip(columns, cells):
                 # Try to get alignment from align attribute
                 cell_align = cell.get("align", "").lower()
 
                 # If not found, try to extract from style attribute
                 if not cell_align:
-                    style = cell.get("style", "")
-                    align_match = re.search(
-                        r"text-align\s*:\s*(left|right|center)", style, re.IGNORECASE
-                    )
+                    align_match = _TEXT_ALIGN_RE.search(cell.get("style", ""))
                     if align_match:
                         cell_align = align_match.group(1).lower()
 
                 # Only count if it's one of our known alignments
-                if cell_align in alignments:
-                    alignments[cell_align] += 1
-
-        # Return most common alignment or empty string if no alignments found
-        return (
-            max(alignments.items(), key=lambda x: x[1])[0]
-            if any(alignments.values())
-            else ""
-        )
+                if cell_align in _ALIGNMENTS:
+                    column.append(cell_align)
+
+        # Most common alignment per column (ties go to the earlier entry in
+        # _ALIGNMENTS), or empty string if no alignments were found
+        alignments = [
+            max(_ALIGNMENTS, key=Counter(column).__getitem__) if column else ""
+            for column in columns
+        ]
+        self._align_cache[key] = alignments
+        return alignments
+
+    def get_column_alignment(self, table, col_idx):
+        """Get alignment for a specific column"""
+        alignments = self.get_column_alignments(table)
+        return alignments[col_idx] if col_idx < len(alignments) else ""
 
     def get_alignment_marker(self, alignment):
         """Get markdown alignment marker"""
@@ -232,8 +297,7 @@ class BetterConverter(MarkdownConverter):
         """
         if el.parent.name == "pre":
             # For code blocks, strip out any markdown links and formatting
-            text = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", text)
-            text = re.sub(r"(\*\*|__|\*|_|~~)", "", text)
+            text = _strip_code_markdown(text)
 
         return super().convert_code(el, text, convert_as_inline)
 
@@ -243,8 +307,7 @@ class BetterConverter(MarkdownConverter):
         """
         if text:
             # Strip any markdown links or formatting
-            text = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", text)
-            text = re.sub(r"(\*\*|__|\*|_|~~)", "", text)
+            text = _strip_code_markdown(text)
 
         return super().convert_pre(el, text, convert_as_inline)
 
@@ -308,7 +371,12 @@ class BetterConverter(MarkdownConverter):
     def convert_div(self, el, text, convert_as_inline):
         """Handle div elements, including Pulumi-choosable"""
         # Check if this is a Pulumi choosable element
-        if el.find("pulumi-choosable"):
+        if self._pulumi_divs is None:
+            has_choosable = el.find("pulumi-choosable") is not None
+        else:
+            has_choosable = id(el) in self._pulumi_divs
+
+        if has_choosable:
             # Find the active content within pulumi-choosable
             active_div = el.find("div", class_="active")
             if active_div:
@@ -388,6 +456,7 @@ class MarkdownSpider:
     ):
         self.base_url = base_url
         self.output_dir = output_dir
+        self.output_dir_abs = os.path.abspath(output_dir)
         self.max_depth = max_depth
         self.num_threads = num_threads
         self.throttle = throttle
@@ -396,6 +465,10 @@ class MarkdownSpider:
         self.timeout = timeout
         self.max_children_per_page = max_children_per_page
         self.already_crawled = set()
+        # Every URL a worker has started fetching, successful or not. Claimed
+        # under the lock so concurrent workers never fetch the same URL twice.
+        self._claimed_urls = set()
+        self._crawled_lock = threading.Lock()
         self.base_domain = urllib.parse.urlparse(base_url).netloc
         self.force_overwrite = force_overwrite
 
@@ -414,6 +487,46 @@ class MarkdownSpider:
                 }
             )
 
+        # Precompute per-config values used on every page
+        for config in self.path_configs:
+            # Scripts, styles and ignored selectors are stripped in one select()
+            config["_ignore_selector"] = ", ".join(
+                ["script", "style", *config.get("ignore_selectors", [])]
+            )
+            config["_exclude_re"] = [
+                re.compile(p) for p in config.get("exclude_patterns", [])
+            ]
+            config["_include_re"] = [
+                re.compile(p) for p in config.get("include_patterns", [])
+            ]
+
+        # Without include/exclude patterns, a URL is crawlable exactly when it
+        # starts with one of the prefixes ("" matches everything). A null
+        # path_prefix from YAML counts as empty too
+        self._path_prefixes = tuple(
+            config.get("path_prefix") or "" for config in self.path_configs
+        )
+        self._prefix_only = not any(
+            config["_exclude_re"] or config["_include_re"]
+            for config in self.path_configs
+        )
+
+        # Configs with a prefix, in priority order, and the fallback config for
+        # URLs that match none of them
+        self._prefixed_configs = [
+            (prefix, config)
+            for prefix, config in zip(self._path_prefixes, self.path_configs)
+            if prefix
+        ]
+        self._default_config = next(
+            (
+                config
+                for prefix, config in zip(self._path_prefixes, self.path_configs)
+                if not prefix
+            ),
+            self.path_configs[0],
+        )
+
         # Headers for requests
         self.headers = headers or {}
         if "User-Agent" not in self.headers:
@@ -424,10 +537,43 @@ class MarkdownSpider:
         # Cookies for requests
         self.cookies = cookies or {}
 
+        # Shared session so worker threads reuse keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.cookies.update(self.cookies)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.num_threads, pool_maxsize=self.num_threads * 2
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Resolve markdownlint once rather than paying npx startup on every page;
+        # HTML output is never formatted, so it doesn't need the linter at all
+        self._is_markdown = self.file_extension.lower() in [".md", ".markdown"]
+        self._markdownlint_cmd = None
+        if self._is_markdown:
+            self._markdownlint_cmd = _find_markdownlint()
+            if self._markdownlint_cmd is None:
+                logger.warning(
+                    "markdownlint-cli2 not found; markdown won't be reformatted"
+                )
+
+        # Prefer the C-backed lxml parser when it is installed
+        try:
+            import lxml  # noqa: F401
+
+            self._parser = "lxml"
+        except ImportError:
+            self._parser = "html.parser"
+
         # Create base directory if it doesn't exist
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
+        # Directories known to exist, so generate_file_path skips makedirs
+        self._known_dirs = {output_dir}
+        self._dirs_lock = threading.Lock()
+
         # Print path configurations for debugging
         logger.debug("Path configurations:")
         for i, config in enumerate(self.path_configs):
@@ -436,77 +582,62 @@ class MarkdownSpider:
             )
 
     def _get_code_language(self, element):
-        """Recursively check element and its children for language specification."""
-
-        def check_element(el):
-            # Check if element is a Tag (not a NavigableString or other non-tag element)
-            if not isinstance(el, Tag):
+        """Find a language specification on the element or its descendants."""
+        match = element
+        if not _has_code_language(match):
+            # select_one walks descendants in document order, like the old recursion
+            match = element.select_one(_CODE_LANGUAGE_SELECTOR)
+            if match is None:
                 return None
 
-            # Check class attribute
-            if el.has_attr("class"):
-                classes = el["class"]
-                if isinstance(classes, str):
-                    classes = [classes]
-                for cls in classes:
-                    if cls.startswith("language-"):
-                        return cls.replace("language-", "")
-
-            # Check data-lang attribute
-            if el.has_attr("data-lang"):
-                return el["data-lang"]
-
-            # Recursively check children
-            for child in el.children:
-                if hasattr(child, "name"):  # Only process tag elements
-                    result = check_element(child)
-                    if result:
-                        return result
-
-            return None
-
-        return check_element(element)
+        for cls in match.get("class", []):
+            if cls.startswith("language-"):
+                return cls[len("language-") :]
+        return match["data-lang"]
 
     def find_config_for_url(self, url):
         """Find the appropriate configuration for a given URL"""
-        for config in self.path_configs:
-            path_prefix = config.get("path_prefix", "")
-            if path_prefix and url.startswith(path_prefix):
+        for path_prefix, config in self._prefixed_configs:
+            if url.startswith(path_prefix):
                 return config
 
-        # Return the first config with empty path_prefix as default, or the first config
-        for config in self.path_configs:
-            if not config.get("path_prefix"):
-                return config
-        return self.path_configs[0]
+        # The first config with empty path_prefix as default, or the first config
+        return self._default_config
 
     def normalize_url(self, url):
         """Normalize a URL by removing trailing slashes and fragments"""
-        parsed = urllib.parse.urlparse(url)
-        return urllib.parse.urlunparse(
-            (parsed.scheme, parsed.netloc, parsed.path.rstrip("/"), None, None, None)
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path
+        # Drop ;params from the last path segment, as urlparse does
+        params_start = path.find(";", path.rfind("/"))
+        if params_start != -1:
+            path = path[:params_start]
+        return urllib.parse.urlunsplit(
+            (parsed.scheme, parsed.netloc, path.rstrip("/"), "", "")
         )
 
     def should_crawl_url(self, url, is_relative=False):
         """Determine if a URL should be crawled based on domain and path restrictions"""
-        parsed_url = urllib.parse.urlparse(url)
-
         # Check domain restriction
-        if self.same_domain_only and parsed_url.netloc != self.base_domain:
+        if (
+            self.same_domain_only
+            and urllib.parse.urlsplit(url).netloc != self.base_domain
+        ):
             if is_relative:
                 logger.debug(
                     f"❌ DOMAIN RESTRICTION: {url} - not in {self.base_domain}"
                 )
             return False
 
+        if self._prefix_only and not is_relative:
+            return url.startswith(self._path_prefixes)
+
         # Check if URL matches any path prefix configuration
         url_matched = False
         matched_config = None
         matched_prefix = None
 
-        for config in self.path_configs:
-            path_prefix = config.get("path_prefix", "")
-
+        for path_prefix, config in zip(self._path_prefixes, self.path_configs):
             # Empty path_prefix matches everything (default config)
             if not path_prefix:
                 url_matched = True
@@ -539,23 +670,24 @@ class MarkdownSpider:
             return False  # Add this check to prevent NoneType errors
 
         # Apply exclude patterns from the matched config
-        exclude_patterns = matched_config.get("exclude_patterns", [])
-        for pattern in exclude_patterns:
-            if re.search(pattern, url):
+        for pattern in matched_config["_exclude_re"]:
+            if pattern.search(url):
                 if is_relative:
-                    logger.debug(f"❌ EXCLUDE PATTERN: {url} - matched {pattern}")
+                    logger.debug(
+                        f"❌ EXCLUDE PATTERN: {url} - matched {pattern.pattern}"
+                    )
                 return False
 
         # Apply include patterns from the matched config
-        include_patterns = matched_config.get("include_patterns", [])
+        include_patterns = matched_config["_include_re"]
         if include_patterns and not any(
-            re.search(pattern, url) for pattern in include_patterns
+            pattern.search(url) for pattern in include_patterns
         ):
             if is_relative:
                 logger.debug(f"❌ INCLUDE PATTERN: {url} - did not match any pattern")
                 logger.debug(f"  Available include patterns:")
                 for pattern in include_patterns:
-                    logger.debug(f"  - {pattern}")
+                    logger.debug(f"  - {pattern.pattern}")
             return False
 
         # URL passed all filters
@@ -570,25 +702,33 @@ class MarkdownSpider:
 
     def format_markdown(self, text: str) -> str:
         """Parse and re-render markdown with Marko"""
+        return self._format_markdown(text)[0]
+
+    def _format_markdown(self, text):
+        """Format markdown, returning (output, formatted)
+
+        formatted is False when markdownlint is missing or failed to run, in which
+        case output has only had the built-in fixes applied.
+        """
         # output = re.sub(r"```\n```", "```\n\n```", output)
-        output = re.sub(
-            r"```\s*\n```", "```\n\n```", text
+        output = _CODE_FENCE_GAP_RE.sub(
+            "```\n\n```", text
         )  # Add blank lines between adjacent code blocks
 
+        if self._markdownlint_cmd is None:
+            return output, False
+
         # Write the raw markdown to a temporary file
-        crawl_temp = "crawl-temp"
         temp_dir = tempfile.gettempdir()
         temp_file = os.path.join(temp_dir, f"crawl-markdown-{uuid.uuid4()}.md")
         with open(temp_file, "w", encoding="utf-8") as f:
             f.write(output)
 
         # Run markdownlint-cli2 to fix the markdown
-        import subprocess
-        import glob
-
+        formatted = True
         try:
             result = subprocess.run(
-                ["npx", "markdownlint-cli2", "--fix", temp_file],
+                [*self._markdownlint_cmd, "--fix", temp_file],
                 check=False,  # We intentionally don't use check=True here to allow non-zero exit codes
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -601,31 +741,63 @@ class MarkdownSpider:
                 logger.debug(
                     f"stderr: {result.stderr.decode('utf-8', errors='replace')}"
                 )
-        except subprocess.SubprocessError as e:
+        except (subprocess.SubprocessError, OSError) as e:
             # This catches actual subprocess failures like missing commands or timeout
             logger.error(f"Failed to run markdownlint: {str(e)}")
-            # return output
+            formatted = False
 
-        # Read the fixed content
-        with open(temp_file, "r", encoding="utf-8") as f:
-            fixed_content = f.read()
-
-        # Remove the temporary file
-        if os.path.exists(temp_file):
+        # Read the fixed content and remove the temporary file
+        try:
+            with open(temp_file, "r", encoding="utf-8") as f:
+                return f.read(), formatted
+        finally:
             os.remove(temp_file)
 
-        return fixed_content
+    def _content_hash_path(self, file_path):
+        """Hidden sidecar file holding the content hashes of file_path"""
+        directory, file_name = os.path.split(file_path)
+        return os.path.join(directory, f".{file_name}.hash")
+
+    def _read_content_hashes(self, hash_path):
+        """Read the stored (source, written) hashes, or None if there aren't any"""
+        try:
+            with open(hash_path, "r", encoding="utf-8") as f:
+                hashes = f.read().split()
+        except OSError:
+            return None
+        return tuple(hashes) if len(hashes) == 2 else None
+
+    def _is_unchanged(self, file_path, hash_path, source_digest):
+        """Whether file_path was written from this source and not edited since"""
+        hashes = self._read_content_hashes(hash_path)
+        if hashes is None or hashes[0] != source_digest:
+            return False
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                on_disk = f.read()
+        except (OSError, UnicodeDecodeError):
+            return False
+        return _content_digest(on_disk) == hashes[1]
 
-    def crawl_url(self, url, file_path):
-        """Crawl a URL and extract content"""
-        if url in self.already_crawled:
+    def _claim_url(self, url):
+        """Atomically mark a URL as taken; False if another worker already has it"""
+        with self._crawled_lock:
+            if url in self._claimed_urls:
+                return False
+            self._claimed_urls.add(url)
+            return True
+
+    def crawl_url(self, url, file_path, claimed=False):
+        """Crawl a URL and extract content
+
+        Pass claimed=True when the caller has already claimed url with _claim_url.
+        """
+        if not claimed and not self._claim_url(url):
             return []
 
         try:
             logger.debug(f"Crawling: {url}")
-            response = requests.get(
-                url, headers=self.headers, cookies=self.cookies, timeout=self.timeout
-            )
+            response = self.session.get(url, timeout=self.timeout)
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Request error for {url}: {e}")
             return []
@@ -647,18 +819,16 @@ class MarkdownSpider:
         # Get config for this URL
         config = self.find_config_for_url(url)
         target_content = config.get("target_content", ["body"])
-        ignore_selectors = config.get("ignore_selectors", [])
-        # Parse HTML
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Strip unwanted tags
-        for script in soup(["script", "style"]):
-            script.decompose()
+        # Parse the raw bytes rather than a decoded response.text. Only pass on a
+        # charset the server declared; otherwise the parser sniffs <meta charset>
+        from_encoding = response.encoding if "charset=" in content_type else None
+        soup = BeautifulSoup(
+            response.content, self._parser, from_encoding=from_encoding
+        )
 
-        # Remove ignored selectors
-        for selector in ignore_selectors:
-            for element in soup.select(selector):
-                element.decompose()
+        # Strip scripts, styles and ignored selectors
+        for element in soup.select(config["_ignore_selector"]):
+            element.decompose()
 
         # Check if we should process this file
         file_exists = os.path.exists(file_path)
@@ -674,7 +844,7 @@ class MarkdownSpider:
                     content += str(tag)
 
             if content:
-                if self.file_extension.lower() in [".md", ".markdown"]:
+                if self._is_markdown:
                     # Create our custom converter
                     converter = BetterConverter(
                         heading_style="ATX",
@@ -684,19 +854,40 @@ class MarkdownSpider:
                     )
 
                     output = converter.convert(content)
-                    output = self.format_markdown(output)
                 else:
                     # Otherwise keep as HTML
                     output = content
 
-                action = "Updated" if file_exists else "Created"
-                logger.info(
-                    f"{action} 📝 {file_name} ({config.get('description', 'unknown config')})"
-                )
+                # Hash before markdownlint runs, so a forced re-crawl of an
+                # unchanged page skips both the formatter and the write
+                digest = _content_digest(output)
+                hash_path = self._content_hash_path(file_path)
+                if file_exists and self._is_unchanged(file_path, hash_path, digest):
+                    logger.debug(f"Skipped writing file (unchanged): {file_name}")
+                else:
+                    formatted = True
+                    if self._is_markdown:
+                        output, formatted = self._format_markdown(output)
+
+                    action = "Updated" if file_exists else "Created"
+                    logger.info(
+                        f"{action} 📝 {file_name} ({config.get('description', 'unknown config')})"
+                    )
 
-                # Write content to file
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(output)
+                    # Write content to file
+                    with open(file_path, "w", encoding="utf-8") as f:
+                        f.write(output)
+
+                    # Record what was written; unformatted output gets no
+                    # hashes, so the next forced run retries the formatter
+                    if formatted:
+                        with open(hash_path, "w", encoding="utf-8") as f:
+                            f.write(f"{digest}\n{_content_digest(output)}\n")
+                    else:
+                        try:
+                            os.remove(hash_path)
+                        except FileNotFoundError:
+                            pass
             else:
                 logger.warning(
                     f"❌ Empty content for {file_path}. Check your target_content selectors."
@@ -704,15 +895,13 @@ class MarkdownSpider:
         else:
             logger.debug(f"Skipped writing file (already exists): {file_name}")
 
-        # Get child URLs
-        child_urls = []
-        for link in soup.find_all("a"):
-            href = link.get("href")
-            if not href:
-                continue
+        # Get child URLs, de-duplicated in discovery order
+        child_urls = {}
+        for link in soup.find_all("a", href=True):
+            href = link["href"]
 
-            # Skip fragment links and javascript links
-            if href.startswith("#") or href.startswith("javascript:"):
+            # Skip empty, fragment and javascript links
+            if not href or href.startswith(("#", "javascript:")):
                 continue
 
             # Handle relative URLs properly
@@ -731,10 +920,12 @@ class MarkdownSpider:
             normalized_url = self.normalize_url(full_url)
 
             # Check if this URL should be crawled
-            if normalized_url not in self.already_crawled and self.should_crawl_url(
-                normalized_url
+            if (
+                normalized_url not in child_urls
+                and normalized_url not in self._claimed_urls
+                and self.should_crawl_url(normalized_url)
             ):
-                child_urls.append(normalized_url)
+                child_urls[normalized_url] = None
                 logger.debug(f"✅ ADDING TO QUEUE: {normalized_url}")
 
         # Limit the number of child URLs if specified
@@ -742,9 +933,17 @@ class MarkdownSpider:
             logger.debug(
                 f"Limiting child URLs from {len(child_urls)} to {self.max_children_per_page}"
             )
-            child_urls = child_urls[: self.max_children_per_page]
+            return list(child_urls)[: self.max_children_per_page]
+
+        return list(child_urls)
 
-        return list(set(child_urls))  # Remove duplicates
+    def _ensure_dir(self, path):
+        """Create a directory unless it is already known to exist"""
+        if path in self._known_dirs:
+            return
+        os.makedirs(path, exist_ok=True)
+        with self._dirs_lock:
+            self._known_dirs.add(path)
 
     def generate_file_path(self, url):
         """Generate an appropriate file path for a URL"""
@@ -755,7 +954,7 @@ class MarkdownSpider:
         base_dir = self.output_dir
         if parsed_url.netloc != self.base_domain:
             base_dir = os.path.join(self.output_dir, domain)
-            os.makedirs(base_dir, exist_ok=True)
+            self._ensure_dir(base_dir)
 
         # Extract path components
         path_parts = parsed_url.path.strip("/").split("/")
@@ -768,40 +967,57 @@ class MarkdownSpider:
             file_name = next((part for part in reversed(path_parts) if part), "index")
 
         # Clean filename and ensure it's valid
-        file_name = re.sub(r"[^a-zA-Z0-9_-]", "-", file_name)
+        file_name = _UNSAFE_FILENAME_RE.sub("-", file_name)
 
         # Create directories for nested paths if needed
         if len(path_parts) > 1 and all(path_parts):
             # Create nested directory structure
             nested_dirs = os.path.join(base_dir, *path_parts[:-1])
-            os.makedirs(nested_dirs, exist_ok=True)
+            self._ensure_dir(nested_dirs)
             return os.path.join(nested_dirs, file_name + self.file_extension)
 
         return os.path.join(base_dir, file_name + self.file_extension)
 
-    def worker(self, q):
-        """Worker thread function"""
-        while not q.empty():
-            try:
-                depth, url = q.get(timeout=1)  # Add timeout to avoid hanging
-            except queue.Empty:
-                break
-
-            if depth > self.max_depth:
-                q.task_done()
-                continue
-
+    def _submit(self, depth, url):
+        """Claim and queue a URL on the worker pool, tracking it as outstanding"""
+        # Claiming before queueing keeps a URL that is queued but not yet
+        # started from being queued again by every page that links to it
+        if self._stopping.is_set() or not self._claim_url(url):
+            return
+        with self._pending_lock:
+            self._pending += 1
+        try:
+            self._pool.submit(self._process, depth, url)
+        except RuntimeError:
+            # The pool shut down after an interrupt; drop the URL quietly
+            self._task_done()
+
+    def _task_done(self):
+        """Mark one outstanding URL as finished"""
+        with self._pending_lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._finished.set()
+
+    def _process(self, depth, url):
+        """Crawl one URL on a pool thread and submit its children"""
+        try:
             # Generate file path for the URL
             file_path = self.generate_file_path(url)
 
             # Crawl the URL and get child URLs
-            child_urls = self.crawl_url(url, file_path)
+            child_urls = self.crawl_url(url, file_path, claimed=True)
 
-            for child_url in child_urls:
-                q.put((depth + 1, child_url))
+            if depth < self.max_depth:
+                for child_url in child_urls:
+                    self._submit(depth + 1, child_url)
 
-            q.task_done()
             time.sleep(self.throttle)  # Be nice to the server
+        except Exception:
+            logger.exception(f"❌ Unexpected error while crawling {url}")
+        finally:
+            # Children were submitted above, so zero really means finished
+            self._task_done()
 
     def run(self):
         """Start the crawling process"""
@@ -813,21 +1029,23 @@ class MarkdownSpider:
         if self.max_children_per_page:
             logger.info(f"Limiting to {self.max_children_per_page} children per page")
 
-        # Create a queue of URLs to crawl
-        q = queue.Queue()
-        q.put((0, self.base_url))
-
-        # Start worker threads
-        threads = []
-        for i in range(self.num_threads):
-            t = threading.Thread(target=self.worker, args=(q,))
-            threads.append(t)
-            t.start()
-            logger.debug(f"Started thread {i+1} of {self.num_threads}")
-
-        # Wait for all threads to finish
-        for t in threads:
-            t.join()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._finished = threading.Event()
+        self._stopping = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=self.num_threads) as pool:
+            self._pool = pool
+            logger.debug(f"Started pool of {self.num_threads} worker threads")
+            self._submit(0, self.base_url)
+            try:
+                self._finished.wait()
+            except KeyboardInterrupt:
+                # Drop queued pages and let only the in-flight ones finish
+                logger.warning("Interrupted; cancelling queued pages")
+                self._stopping.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
 
         logger.info("🏁 All threads have finished")
         logger.info(f"Total pages crawled: {len(self.already_crawled)}")